@@ -2,19 +2,22 @@ import os
 import cv2 # type: ignore
 import numpy as np
 from PIL import Image
+from hue_tiles import hue_tile_map, save_hue_tile_map
 
-def remove_bubbles(image_path):
+def remove_bubbles(image_path, canny_threshold1=50, canny_threshold2=150, kernel_size=5,
+                   dilate_iterations=2, erode_iterations=2, min_area=100, max_area=10000):
+    # 参数默认值为手调常数，可用 bubble_tuning.py 在标注数据上自动调优
     # 读取图片并转换为灰度图
     img = cv2.imread(image_path)
     gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
 
     # 使用Canny边缘检测找到边缘
-    edges = cv2.Canny(gray, threshold1=50, threshold2=150)
+    edges = cv2.Canny(gray, threshold1=canny_threshold1, threshold2=canny_threshold2)
 
     # 进行形态学操作，膨胀然后腐蚀，增强边缘
-    kernel = np.ones((5,5), np.uint8)
-    edges_dilated = cv2.dilate(edges, kernel, iterations=2)
-    edges_eroded = cv2.erode(edges_dilated, kernel, iterations=2)
+    kernel = np.ones((kernel_size, kernel_size), np.uint8)
+    edges_dilated = cv2.dilate(edges, kernel, iterations=dilate_iterations)
+    edges_eroded = cv2.erode(edges_dilated, kernel, iterations=erode_iterations)
 
     # 找到轮廓
     contours, _ = cv2.findContours(edges_eroded, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
@@ -23,16 +26,17 @@ def remove_bubbles(image_path):
     for contour in contours:
         # 过滤掉面积太小或太大的轮廓
         area = cv2.contourArea(contour)
-        if 100 < area < 10000:  # 根据实际情况调整气泡大小的范围
+        if min_area < area < max_area:  # 根据实际情况调整气泡大小的范围
             # 画出轮廓并填充
             cv2.drawContours(img, [contour], -1, (0, 0, 0), thickness=cv2.FILLED)
 
     # 返回遮盖气泡后的图片
     return img
 
-def calculate_average_hue_without_black(image_path, brightness_threshold=0.1):
-    # 移除气泡
-    img = remove_bubbles(image_path)
+def calculate_average_hue_without_black(image_path, brightness_threshold=0.1, img=None):
+    # 移除气泡（已经遮盖过的图片可以直接传入 img）
+    if img is None:
+        img = remove_bubbles(image_path)
 
     # 将处理后的图片转换为RGB模式
     img_pil = Image.fromarray(cv2.cvtColor(img, cv2.COLOR_BGR2RGB))
@@ -86,25 +90,32 @@ def calculate_average_hue_without_black(image_path, brightness_threshold=0.1):
     average_hue = np.mean(hue_values)
     return average_hue
 
-def process_images_in_folder(folder_path, brightness_threshold=0.1):
+def process_images_in_folder(folder_path, brightness_threshold=0.1, tile_size=None):
     print(f"\nProcessing folder: {folder_path}")
     for filename in os.listdir(folder_path):
         if filename.endswith(('.png', '.jpg', '.jpeg', '.bmp', '.tiff')):
             image_path = os.path.join(folder_path, filename)
             try:
-                average_hue = calculate_average_hue_without_black(image_path, brightness_threshold)
+                img = remove_bubbles(image_path)
+                average_hue = calculate_average_hue_without_black(image_path, brightness_threshold, img=img)
                 if average_hue is not None:
                     print(f"Image: {filename}, Average Hue (without black and bubbles): {average_hue:.2f}")
                 else:
                     print(f"Image: {filename}, no valid pixels (after black removal and bubble masking).")
+
+                # 可选：保存分块色相图（tile_size × tile_size 像素一块）；
+                # 上面算出的平均色相定义与分块色相不同，另存为 script_average_hue
+                if tile_size:
+                    tile_map = hue_tile_map(img, tile_size, brightness_threshold, space="hsv")
+                    save_hue_tile_map(image_path, tile_map, script_average_hue=average_hue)
             except Exception as e:
                 print(f"Error processing {filename}: {e}")
 
-def process_multiple_folders(base_folder_path, brightness_threshold=0.1):
+def process_multiple_folders(base_folder_path, brightness_threshold=0.1, tile_size=None):
     # 遍历所有子文件夹
     for root, dirs, files in os.walk(base_folder_path):
         if files:  # 如果当前文件夹有文件，处理图片
-            process_images_in_folder(root, brightness_threshold)
+            process_images_in_folder(root, brightness_threshold, tile_size)
 
 # 指定包含多个文件夹的根文件夹路径
 base_folder_path = "D:\Research"
@@ -0,0 +1,170 @@
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import cv2  # type: ignore
+import numpy as np
+
+# =============================================================================
+# remove_bubbles 参数的并行自动调优
+#
+# 在一小组带标注的图片上评估参数网格，按气泡掩码与标注掩码的 IoU 排序。
+# 每张图片的处理流程为：灰度图 → Canny → 膨胀 → 腐蚀 → 轮廓 → 面积筛选，
+# 参数网格按此顺序做深度优先遍历，共享前缀的参数组合复用同一个中间结果：
+#   - 灰度图每张图片只算一次；
+#   - Canny 边缘图每组 (threshold1, threshold2) 只算一次；
+#   - 膨胀 / 腐蚀按迭代次数从小到大增量计算（n 次 = n-1 次的结果再做 1 次）；
+#   - 轮廓、面积及逐轮廓的像素统计每个形态学结果只算一次，
+#     面积上下限的筛选只需对选中轮廓的统计量求和。
+# 不同图片分配到进程池中并行处理。
+#
+# 标注数据目录：每张图片 <名称>.png 旁边放一张 <名称>_mask.png，非零像素表示气泡。
+# =============================================================================
+
+# 与 remove_bubbles 当前手调常数对应的默认参数
+DEFAULT_PARAMS = {
+    "canny_threshold1": 50,
+    "canny_threshold2": 150,
+    "kernel_size": 5,
+    "dilate_iterations": 2,
+    "erode_iterations": 2,
+    "min_area": 100,
+    "max_area": 10000,
+}
+
+# 默认搜索网格
+DEFAULT_GRID = {
+    "canny_threshold1": [30, 50, 80],
+    "canny_threshold2": [100, 150, 200],
+    "kernel_size": [3, 5, 7],
+    "dilate_iterations": [1, 2, 3],
+    "erode_iterations": [1, 2, 3],
+    "min_area": [50, 100, 200],
+    "max_area": [5000, 10000, 20000],
+}
+
+PARAM_NAMES = tuple(DEFAULT_PARAMS)
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp', '.tiff')
+
+
+def load_labeled_set(folder_path):
+    """返回 [(图片路径, 标注掩码路径), ...]"""
+    pairs = []
+    for filename in sorted(os.listdir(folder_path)):
+        stem, ext = os.path.splitext(filename)
+        if ext.lower() not in IMAGE_EXTENSIONS or stem.endswith("_mask"):
+            continue
+        mask_path = os.path.join(folder_path, stem + "_mask.png")
+        if os.path.exists(mask_path):
+            pairs.append((os.path.join(folder_path, filename), mask_path))
+    return pairs
+
+
+def parameter_grid(grid=None):
+    """按处理流程顺序展开参数网格，返回参数元组列表（顺序与 PARAM_NAMES 一致）"""
+    grid = {**DEFAULT_GRID, **(grid or {})}
+    return list(itertools.product(*(sorted(grid[name]) for name in PARAM_NAMES)))
+
+
+def bubble_mask(gray, canny_threshold1=50, canny_threshold2=150, kernel_size=5,
+                dilate_iterations=2, erode_iterations=2, min_area=100, max_area=10000):
+    """单组参数下的气泡掩码（与 remove_bubbles 中被涂黑的区域相同），用于核对调优结果"""
+    edges = cv2.Canny(gray, threshold1=canny_threshold1, threshold2=canny_threshold2)
+    kernel = np.ones((kernel_size, kernel_size), np.uint8)
+    edges = cv2.dilate(edges, kernel, iterations=dilate_iterations)
+    edges = cv2.erode(edges, kernel, iterations=erode_iterations)
+    contours, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    selected = [c for c in contours if min_area < cv2.contourArea(c) < max_area]
+    mask = np.zeros(gray.shape, np.uint8)
+    cv2.drawContours(mask, selected, -1, 255, thickness=cv2.FILLED)
+    return mask > 0
+
+
+def _contour_stats(edges, truth):
+    """提取轮廓并统计每个轮廓的 (面积, 填充像素数, 与标注重叠的像素数)
+
+    轮廓按编号填充到标签图上，再用 np.bincount 一次性统计，
+    之后任意面积上下限下的 IoU 只需对选中轮廓的统计量求和。
+    """
+    contours, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    labels = np.zeros(edges.shape, np.int32)
+    for i, contour in enumerate(contours):
+        cv2.drawContours(labels, [contour], -1, i + 1, thickness=cv2.FILLED)
+    n = len(contours) + 1
+    pixels = np.bincount(labels.ravel(), minlength=n)[1:]
+    overlap = np.bincount(labels[truth], minlength=n)[1:]
+    areas = np.array([cv2.contourArea(c) for c in contours])
+    return areas, pixels, overlap
+
+
+def _evaluate_image(args):
+    """对一张图片评估整个参数网格，返回与 params 顺序一致的 IoU 数组（供进程池调用）"""
+    image_path, mask_path, params = args
+    gray = cv2.cvtColor(cv2.imread(image_path), cv2.COLOR_BGR2GRAY)
+    truth = cv2.imread(mask_path, cv2.IMREAD_GRAYSCALE) > 0
+    truth_pixels = np.count_nonzero(truth)
+
+    # 按前缀分组：(t1, t2) → kernel → dilate → erode → [(min_area, max_area, 序号)]
+    tree = {}
+    for index, p in enumerate(params):
+        t1, t2, k, d, e, a_min, a_max = p
+        tree.setdefault((t1, t2), {}).setdefault(k, {}).setdefault(d, {}) \
+            .setdefault(e, []).append((a_min, a_max, index))
+
+    scores = np.empty(len(params))
+    for (t1, t2), by_kernel in tree.items():
+        edges = cv2.Canny(gray, threshold1=t1, threshold2=t2)
+        for k, by_dilate in by_kernel.items():
+            kernel = np.ones((k, k), np.uint8)
+            dilated, done_d = edges, 0
+            for d in sorted(by_dilate):
+                dilated = cv2.dilate(dilated, kernel, iterations=d - done_d) if d > done_d else dilated
+                done_d = d
+                eroded, done_e = dilated, 0
+                for e in sorted(by_dilate[d]):
+                    eroded = cv2.erode(eroded, kernel, iterations=e - done_e) if e > done_e else eroded
+                    done_e = e
+                    areas, pixels, overlap = _contour_stats(eroded, truth)
+                    for a_min, a_max, index in by_dilate[d][e]:
+                        keep = (areas > a_min) & (areas < a_max)
+                        intersection = overlap[keep].sum()
+                        union = pixels[keep].sum() + truth_pixels - intersection
+                        scores[index] = intersection / union if union else 1.0
+    return scores
+
+
+def tune_remove_bubbles(folder_path, grid=None, workers=None, top=10):
+    """在标注数据上评估参数网格，返回按平均 IoU 从高到低排序的前 top 个结果
+
+    每个结果为 (参数字典, 平均 IoU, IoU 标准差)，参数字典可直接传给 remove_bubbles(image_path, **params)。
+    """
+    pairs = load_labeled_set(folder_path)
+    if not pairs:
+        raise FileNotFoundError(f"{folder_path} 中没有找到带 _mask.png 标注的图片")
+
+    params = parameter_grid(grid)
+    tasks = [(image_path, mask_path, params) for image_path, mask_path in pairs]
+    if workers is None:
+        scores = np.array(list(map(_evaluate_image, tasks)))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            scores = np.array(list(executor.map(_evaluate_image, tasks)))
+
+    mean = scores.mean(axis=0)
+    std = scores.std(axis=0)
+    order = np.argsort(-mean, kind="stable")[:top]
+    return [(dict(zip(PARAM_NAMES, params[i])), mean[i], std[i]) for i in order]
+
+
+if __name__ == "__main__":
+    import time
+
+    # 指定标注数据所在的文件夹
+    labeled_folder_path = "D:\\Research\\labeled"
+
+    start = time.perf_counter()
+    ranking = tune_remove_bubbles(labeled_folder_path, workers=os.cpu_count())
+    print(f"共 {len(parameter_grid())} 组参数，耗时 {time.perf_counter() - start:.1f} s")
+    for params, mean_iou, std_iou in ranking:
+        print(f"IoU = {mean_iou:.3f} ± {std_iou:.3f}  {params}")
@@ -0,0 +1,110 @@
+import numpy as np
+import colour  # 需要先安装： pip install colour-science
+
+import drude
+from metamerism import WAVELENGTHS, resample_spectra, tristimulus_weights
+from sweep import AXES, drude_reflectance
+
+# =============================================================================
+# 设计空间颜色图：模拟反射光谱直接进入色度计算
+#
+# 整个参数网格（例如 n_env × gamma）的模拟反射光谱一次性重采样到 380–780 nm / 5 nm，
+# 再用矩阵乘法得到 XYZ，并计算 Lab、Hue、Chroma 和 sRGB，
+# 全程只使用 NumPy 数组，不经过 SpectralDistribution 对象或 Excel。
+# =============================================================================
+
+
+def spectra_to_colour(wavelength_nm, reflectance, illuminant="D65",
+                      observer="CIE 1931 2 Degree Standard Observer"):
+    """将任意形状 (..., len(wavelength_nm)) 的反射光谱批量转换为颜色
+
+    返回字典：XYZ、Lab、sRGB 的形状为 (..., 3)，Hue、Chroma 的形状为 (...)。
+    """
+    R = resample_spectra(wavelength_nm, reflectance, WAVELENGTHS)
+    weights = tristimulus_weights((illuminant,), (observer,), WAVELENGTHS)[0, 0]  # (L, 3)
+
+    XYZ = R @ weights
+    whitepoint = colour.XYZ_to_xy(weights.sum(axis=0) / 100)
+    Lab = colour.XYZ_to_Lab(XYZ / 100, illuminant=whitepoint)
+    LCH = colour.Lab_to_LCHab(Lab)
+
+    # sRGB 仅用于显示，超出色域的部分截断到 [0, 1]；
+    # 以实际光源的白点做 CAT02 色适应，非 D65 光源下中性灰仍显示为灰色
+    rgb = np.clip(colour.XYZ_to_sRGB(XYZ / 100, illuminant=whitepoint), 0, 1)
+
+    return {
+        "XYZ": XYZ,
+        "Lab": Lab,
+        "Chroma": LCH[..., 1],
+        "Hue": LCH[..., 2],
+        "sRGB": rgb,
+    }
+
+
+def design_space_colour_map(n_env, gamma, wp=drude.wp, wavelength_nm=WAVELENGTHS, theta_inc=0,
+                            **kwargs):
+    """计算 n_env × gamma 网格上银的 Drude 反射颜色，返回值中各数组的前两维为 (len(n_env), len(gamma))
+
+    默认直接在色度计算所用的 380–780 nm / 5 nm 波长上模拟，重采样矩阵退化为单位矩阵。
+    """
+    n_env = np.atleast_1d(np.asarray(n_env, dtype=float))
+    gamma = np.atleast_1d(np.asarray(gamma, dtype=float))
+
+    N, G = np.meshgrid(n_env, gamma, indexing="ij")
+    spectra = drude_reflectance(wavelength_nm, np.full(N.size, wp), G.ravel(), N.ravel(),
+                                theta_inc=theta_inc)
+    result = spectra_to_colour(wavelength_nm, spectra.reshape(N.shape + (-1,)), **kwargs)
+    result["n_env"] = n_env
+    result["gamma"] = gamma
+    return result
+
+
+def colour_map_from_sweep(store, **kwargs):
+    """对 sweep.py 扫描结果中的切片（例如 wp=1.39e16）计算颜色
+
+    坐标参数与 store.sel() 相同，其余参数传给 spectra_to_colour。
+    扫描结果按 (wp, gamma, n_env) 存储，这里把 gamma、n_env 两维交换为
+    与 design_space_colour_map 相同的 (n_env, gamma) 顺序，并附上所选的坐标值，
+    因此 plot_colour_map(colour_map_from_sweep(store, wp=...)) 可以直接绘图。
+    """
+    coords = {name: kwargs.pop(name) for name in AXES if name in kwargs}
+    spectra = store.sel(**coords)
+    axes = store.sel_axes(**coords)
+    if np.ndim(axes["gamma"]) and np.ndim(axes["n_env"]):
+        spectra = np.swapaxes(spectra, -3, -2)
+    result = spectra_to_colour(store.wavelength_nm, spectra, **kwargs)
+    result.update(axes)
+    return result
+
+
+def plot_colour_map(result, save_path=None):
+    """绘制 n_env × gamma 的 sRGB 颜色图和 Hue 等值线"""
+    import matplotlib.pyplot as plt
+
+    n_env, gamma = result["n_env"], result["gamma"]
+    extent = [gamma[0], gamma[-1], n_env[0], n_env[-1]]
+
+    fig, ax = plt.subplots(figsize=(6, 5))
+    ax.imshow(result["sRGB"], origin="lower", extent=extent, aspect="auto")
+    contours = ax.contour(gamma, n_env, result["Hue"], colors="k", linewidths=0.5)
+    ax.clabel(contours, fmt="%.0f°", fontsize=7)
+    ax.set_xlabel("gamma (rad/s)")
+    ax.set_ylabel("n_env")
+    ax.set_title("Design-space Colour Map (Hue contours)")
+
+    if save_path:
+        fig.savefig(save_path, dpi=300, bbox_inches="tight")
+    return fig
+
+
+if __name__ == "__main__":
+    import time
+    import matplotlib.pyplot as plt
+
+    start = time.perf_counter()
+    result = design_space_colour_map(n_env=np.linspace(1.0, 1.6, 301),
+                                     gamma=np.linspace(1e13, 5e14, 400))
+    print(f"{result['Hue'].size} 个设计点，耗时 {time.perf_counter() - start:.2f} s")
+
+    plot_colour_map(result, save_path="design_space_colour_map.png")
+    plt.show()
@@ -0,0 +1,217 @@
+import numpy as np
+
+# =============================================================================
+# 截顶圆锥的体素化（与 stracture.py 中 Lumerical 结构脚本的几何定义一致）
+#
+# 圆锥轴沿 z，中心位于 z = 0：底面 z = -z_span/2 处半径为 r_bottom，
+# 顶面 z = +z_span/2 处半径为 r_top，半锥角 theta = atan((r_bottom - r_top) / z_span)，
+# 被截去的锥尖长度 ht = r_top / tan(theta)。
+#
+# 体素填充率用有符号距离近似做亚体素抗锯齿：
+#     coverage = clip(0.5 - d / w, 0, 1)
+# 其中 d 为体素中心到表面的法向距离，w 为体素在该法向上的宽度。
+# 所有计算对体素（以及批量几何参数）向量化，没有逐体素的 Python 循环。
+# =============================================================================
+
+
+def cone_angles(r_top, r_bottom, z_span):
+    """返回半锥角 theta（弧度）和被截去的锥尖长度 ht，与 stracture.py 相同"""
+    r_top = np.asarray(r_top, dtype=float) + 1e-20  # avoid divide by zero problem
+    theta = np.arctan((np.asarray(r_bottom, dtype=float) - r_top) / z_span)
+    with np.errstate(divide="ignore"):
+        ht = r_top / np.tan(theta)
+    return theta, ht
+
+
+def cone_radius(z, r_top, r_bottom, z_span):
+    """高度 z 处的圆锥半径（z 从 -z_span/2 到 +z_span/2）"""
+    return r_bottom + (r_top - r_bottom) * (z / z_span + 0.5)
+
+
+def frustum_volume(r_top, r_bottom, z_span):
+    """截顶圆锥体积的解析值"""
+    return np.pi * z_span * (r_top**2 + r_top * r_bottom + r_bottom**2) / 3
+
+
+def cone_coverage(x, y, z, r_top, r_bottom, z_span, center=(0.0, 0.0, 0.0),
+                  voxel=(1.0, 1.0, 1.0)):
+    """计算体素中心 (x, y, z) 处的抗锯齿填充率 [0, 1]
+
+    x、y、z 与圆锥参数均按 NumPy 规则广播，因此既可以对一个圆锥的整个网格求值，
+    也可以在最前面加一维对多组几何参数同时求值。voxel 为体素尺寸 (dx, dy, dz)。
+    """
+    dx, dy, dz = voxel
+    x = x - center[0]
+    y = y - center[1]
+    z = z - center[2]
+
+    rho = np.hypot(x, y)
+    slope = (r_top - r_bottom) / z_span
+    norm = np.sqrt(1 + slope**2)
+
+    # 侧面的外法向 (cosφ, sinφ, -slope) / norm，及体素在该法向上的宽度
+    with np.errstate(invalid="ignore", divide="ignore"):
+        cos_phi = np.where(rho > 0, x / rho, 1.0)
+        sin_phi = np.where(rho > 0, y / rho, 0.0)
+    width_side = (np.abs(cos_phi) * dx + np.abs(sin_phi) * dy + np.abs(slope) * dz) / norm
+    d_side = (rho - cone_radius(z, r_top, r_bottom, z_span)) / norm
+
+    # 上下端面
+    d_cap = np.abs(z) - z_span / 2
+
+    side = np.clip(0.5 - d_side / width_side, 0, 1)
+    cap = np.clip(0.5 - d_cap / dz, 0, 1)
+    return side * cap
+
+
+def grid_centers(span, n):
+    """返回跨度 span、n 个体素的中心坐标（以 0 为中心）和体素尺寸"""
+    step = span / n
+    return (np.arange(n) - (n - 1) / 2) * step, step
+
+
+def voxelize_cones(x, y, z, cones, index_cone, index_background=1.0):
+    """将多个圆锥栅格化到同一个三维网格上，返回 (填充率, 介电常数, 折射率)
+
+    x、y、z 为一维体素中心坐标（等间距）；cones 为字典，包含等长数组
+    r_top、r_bottom、z_span、x0、y0、z0。重叠部分的填充率取并集上限 1。
+    介电常数按填充率线性混合（亚像素平均）。
+    """
+    voxel = (x[1] - x[0], y[1] - y[0], z[1] - z[0])
+    X, Y, Z = x[:, None, None], y[None, :, None], z[None, None, :]
+
+    fill = np.zeros((len(x), len(y), len(z)))
+    n_cones = len(np.atleast_1d(cones["r_top"]))
+    for i in range(n_cones):
+        r_top = np.atleast_1d(cones["r_top"])[i]
+        r_bottom = np.atleast_1d(cones["r_bottom"])[i]
+        z_span = np.atleast_1d(cones["z_span"])[i]
+        center = tuple(np.atleast_1d(cones[key])[i] for key in ("x0", "y0", "z0"))
+
+        # 只在圆锥的包围盒内求值
+        r_max = max(r_top, r_bottom) + max(voxel)
+        sx = slice(*np.searchsorted(x, [center[0] - r_max, center[0] + r_max]))
+        sy = slice(*np.searchsorted(y, [center[1] - r_max, center[1] + r_max]))
+        sz = slice(*np.searchsorted(z, [center[2] - z_span / 2 - voxel[2],
+                                        center[2] + z_span / 2 + voxel[2]]))
+        coverage = cone_coverage(X[sx], Y[:, sy], Z[:, :, sz], r_top, r_bottom, z_span,
+                                 center, voxel)
+        fill[sx, sy, sz] = np.minimum(fill[sx, sy, sz] + coverage, 1.0)
+
+    eps = index_background**2 + fill * (index_cone**2 - index_background**2)
+    return fill, eps, np.sqrt(eps)
+
+
+def unit_cell_fill(r_top, r_bottom, z_span, period, shape=(32, 32, 32)):
+    """对 G 组几何参数同时体素化一个周期单元，返回 (G, nx, ny, nz) 的填充率
+
+    单元横向尺寸为 period × period，纵向为 z_span，圆锥位于单元中心。
+    所有几何参数为长度 G 的数组；内存占用为 G × nx × ny × nz，大批量时请分块调用。
+    """
+    r_top, r_bottom, z_span, period = (np.asarray(a, dtype=float).reshape(-1, 1, 1, 1)
+                                       for a in np.broadcast_arrays(r_top, r_bottom,
+                                                                    z_span, period))
+    nx, ny, nz = shape
+    u, _ = grid_centers(1.0, nx)
+    v, _ = grid_centers(1.0, ny)
+    w, _ = grid_centers(1.0, nz)
+    x = u[None, :, None, None] * period
+    y = v[None, None, :, None] * period
+    z = w[None, None, None, :] * z_span
+    voxel = (period / nx, period / ny, z_span / nz)
+    return cone_coverage(x, y, z, r_top, r_bottom, z_span, voxel=voxel)
+
+
+def fill_factor(r_top, r_bottom, z_span, period):
+    """周期单元 (period × period × z_span) 的体积填充率（解析值，对参数数组向量化）"""
+    return frustum_volume(r_top, r_bottom, z_span) / (period**2 * z_span)
+
+
+def effective_index_profile(r_top, r_bottom, z_span, period, index_cone,
+                            index_background=1.0, nz=50, method="linear"):
+    """沿 z 分层计算等效介质折射率，返回 (z 坐标, 形状为 (G, nz) 的等效折射率)
+
+    每层的面积填充率 f(z) = π·r(z)² / period² 由解析式给出。
+    method="linear" 为介电常数体积平均，method="maxwell-garnett" 为 Maxwell-Garnett 公式。
+    """
+    r_top, r_bottom, z_span, period = (np.asarray(a, dtype=float)[:, None]
+                                       for a in np.broadcast_arrays(
+                                           np.atleast_1d(r_top), r_bottom, z_span, period))
+    t, _ = grid_centers(1.0, nz)
+    z = t[None, :] * z_span
+    f = np.clip(np.pi * cone_radius(z, r_top, r_bottom, z_span)**2 / period**2, 0, 1)
+
+    eps_i = index_cone**2
+    eps_h = index_background**2
+    if method == "linear":
+        eps = eps_h + f * (eps_i - eps_h)
+    elif method == "maxwell-garnett":
+        # 二维（柱状夹杂）Maxwell-Garnett 公式
+        beta = (eps_i - eps_h) / (eps_i + eps_h)
+        eps = eps_h * (1 + f * beta) / (1 - f * beta)
+    else:
+        raise ValueError(f"未知的 method: {method}")
+    return z, np.sqrt(eps)
+
+
+def write_lsf_batch(path, r_top, r_bottom, z_span, x0=0.0, y0=0.0, z0=0.0,
+                    material="<Object defined dielectric>", index=1.4):
+    """为一批几何参数生成一个 Lumerical .lsf 脚本（单位 m），每个圆锥一个 custom 结构
+
+    结构创建方式与 stracture.py 相同：绕轴旋转一条直线生成圆锥，再绕 y 轴旋转 90°。
+    """
+    params = np.broadcast_arrays(np.atleast_1d(r_top), r_bottom, z_span, x0, y0, z0)
+    lines = ["deleteall;", ""]
+    for i, (rt, rb, zs, xc, yc, zc) in enumerate(zip(*params)):
+        # 与 stracture.py 中 r_top/ht*(x + z_span/2 + ht) 等价的直线方程（µm），
+        # 写成 r_top + tan(theta)*(x + z_span/2) 的形式，r_top == r_bottom 时也不会除零
+        slope = (rb - rt) / zs
+        eqn = f"{rt * 1e6:.9g}+{slope:.9g}*(x+{zs / 2 * 1e6:.9g})"
+        lines += [
+            f"# cone {i}: r_top={rt:.6g}, r_bottom={rb:.6g}, z_span={zs:.6g}",
+            "addcustom;",
+            f'set("name","cone_{i}");',
+            f'set("x",{xc:.9g});',
+            f'set("y",{yc:.9g});',
+            f'set("z",{zc:.9g});',
+            'set("first axis","y");',
+            'set("rotation 1",90);',
+            f'set("x span",{zs:.9g});',
+            f'set("y span",{2 * max(rb, rt):.9g});',
+            f'set("z span",{2 * max(rb, rt):.9g});',
+            'set("create 3D object by","revolution");',
+            f'set("equation 1","{eqn}");',
+            f'set("material","{material}");',
+        ]
+        if material == "<Object defined dielectric>":
+            lines.append(f'set("index",{index:.9g});')
+        lines.append("")
+
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines))
+
+
+if __name__ == "__main__":
+    import time
+
+    # 单个圆锥：体素化体积与解析体积对比
+    x, _ = grid_centers(400e-9, 80)
+    z, _ = grid_centers(300e-9, 60)
+    cones = {"r_top": [50e-9], "r_bottom": [150e-9], "z_span": [300e-9],
+             "x0": [0.0], "y0": [0.0], "z0": [0.0]}
+    fill, eps, index = voxelize_cones(x, x, z, cones, index_cone=1.5)
+    dV = (x[1] - x[0])**2 * (z[1] - z[0])
+    print(f"体素化体积 / 解析体积 = {fill.sum() * dV / frustum_volume(50e-9, 150e-9, 300e-9):.4f}")
+
+    # 批量预筛选：数千组几何的填充率和等效折射率分布
+    rng = np.random.default_rng(0)
+    G = 5000
+    r_top = rng.uniform(10e-9, 100e-9, G)
+    r_bottom = rng.uniform(100e-9, 200e-9, G)
+    start = time.perf_counter()
+    ff = fill_factor(r_top, r_bottom, 300e-9, 450e-9)
+    z_eff, n_eff = effective_index_profile(r_top, r_bottom, 300e-9, 450e-9, index_cone=1.5)
+    print(f"{G} 组几何，耗时 {(time.perf_counter() - start) * 1e3:.1f} ms，"
+          f"填充率范围 {ff.min():.3f}–{ff.max():.3f}")
+
+    write_lsf_batch("cones_batch.lsf", r_top[:10], r_bottom[:10], 300e-9)
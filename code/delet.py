@@ -1,5 +1,5 @@
 import numpy as np
-from scipy.optimize import fsolve
+from nk_inversion import solve_n
 
 data = {
     1000: 0.977314,
@@ -11,21 +11,13 @@ data = {
 
 n_env = 1.33
 
-def equations(params, R, n_env):
-    n, k = params
-    numerator = (n - n_env)**2 + k**2
-    denominator = (n + n_env)**2 + k**2
-    return [
-        R - numerator / denominator,
-        0  
-    ]
+k_fixed = 3.0
 
-results = {}
-for wavelength, reflectance in data.items():
-    initial_guess = (0.2, 3.0)
-    solution = fsolve(equations, initial_guess, args=(reflectance, n_env))
-    results[wavelength] = solution
+wavelengths = np.array(list(data.keys()), dtype=float)
+reflectance = np.array(list(data.values()))
+n_values = solve_n(reflectance, k_fixed, n_env)
+k_values = np.full_like(n_values, k_fixed)
 
 print("Wavelength (nm), n, k")
-for wavelength, (n, k) in results.items():
-    print(f"{wavelength:.3f}, {n:.6f}, {k:.6f}")
\ No newline at end of file
+for wavelength, n, k in zip(wavelengths, n_values, k_values):
+    print(f"{wavelength:.3f}, {n:.6f}, {k:.6f}")
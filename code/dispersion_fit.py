@@ -0,0 +1,180 @@
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from scipy.optimize import least_squares
+
+import drude
+
+# =============================================================================
+# 全光谱 Drude–Lorentz 色散拟合
+#
+# 不再逐个波长用 fsolve 求 (n, k)，而是把整条实测反射光谱作为一个最小二乘问题，
+# 拟合 ε_inf、wp、gamma 以及可选的 Lorentz 振子参数。
+# 残差和解析雅可比矩阵均对波长向量化；多起点拟合和多条光谱拟合可放入进程池并行。
+#
+# 参数向量顺序：[eps_inf, wp, gamma, f_1, omega_1, gamma_1, f_2, ...]
+# 频率类参数在内部以 OMEGA_UNIT 为单位，避免 1e16 量级带来的数值病态。
+# =============================================================================
+
+OMEGA_UNIT = 1e15  # 内部频率单位 (rad/s)
+
+
+def pack_params(eps_inf=1.0, wp=drude.wp, gamma=drude.gamma, oscillators=()):
+    """将物理参数打包成内部参数向量（频率以 OMEGA_UNIT 为单位）"""
+    p = [eps_inf, wp / OMEGA_UNIT, gamma / OMEGA_UNIT]
+    for f, omega_0, gamma_0 in oscillators:
+        p += [f, omega_0 / OMEGA_UNIT, gamma_0 / OMEGA_UNIT]
+    return np.array(p, dtype=float)
+
+
+def unpack_params(p):
+    """将内部参数向量还原为物理参数字典（频率单位 rad/s）"""
+    oscillators = [(p[i], p[i + 1] * OMEGA_UNIT, p[i + 2] * OMEGA_UNIT)
+                   for i in range(3, len(p), 3)]
+    return {
+        "eps_inf": p[0],
+        "wp": p[1] * OMEGA_UNIT,
+        "gamma": p[2] * OMEGA_UNIT,
+        "oscillators": oscillators,
+    }
+
+
+def epsilon_and_derivatives(omega, p):
+    """计算 ε(ω) 及其对每个参数的解析导数，返回 (ε, dε/dp)，dε/dp 形状为 (len(p), len(ω))"""
+    w = np.asarray(omega, dtype=float) / OMEGA_UNIT
+    eps_inf, wp, gamma = p[:3]
+
+    d_drude = w**2 + 1j * gamma * w
+    epsilon = eps_inf - wp**2 / d_drude
+
+    grads = np.empty((len(p), len(w)), dtype=complex)
+    grads[0] = 1.0
+    grads[1] = -2 * wp / d_drude
+    grads[2] = 1j * wp**2 * w / d_drude**2
+
+    for i in range(3, len(p), 3):
+        f, w0, g0 = p[i:i + 3]
+        d_lorentz = w0**2 - w**2 - 1j * g0 * w
+        epsilon = epsilon + f * w0**2 / d_lorentz
+        grads[i] = w0**2 / d_lorentz
+        grads[i + 1] = 2 * f * w0 * (-w**2 - 1j * g0 * w) / d_lorentz**2
+        grads[i + 2] = 1j * f * w0**2 * w / d_lorentz**2
+
+    return epsilon, grads
+
+
+def model_reflectance(omega, p, n_env=1.0, jacobian=False):
+    """垂直入射反射率 R(ω)，可同时返回对参数的解析雅可比矩阵 (len(ω), len(p))"""
+    epsilon, grads = epsilon_and_derivatives(omega, p)
+    N = drude.refractive_index(epsilon)
+    r = (n_env - N) / (n_env + N)
+    R = np.abs(r)**2
+    if not jacobian:
+        return R
+
+    # 链式法则：dR/dp = 2·Re(conj(r)·dr/dN·dN/dε·dε/dp)
+    dr_deps = -2 * n_env / (n_env + N)**2 / (2 * N)
+    J = 2 * np.real(np.conj(r) * dr_deps * grads)
+    return R, J.T
+
+
+def default_bounds(n_params):
+    """参数的默认上下界：ε_inf ∈ [1, 20]，其余参数非负"""
+    lower = np.zeros(n_params)
+    upper = np.full(n_params, np.inf)
+    lower[0], upper[0] = 1.0, 20.0
+    return lower, upper
+
+
+def _fit_once(args):
+    """从一个初始值出发做一次最小二乘拟合（供进程池调用）"""
+    omega, reflectance, weights, p0, free, n_env, bounds = args
+    p_full = p0.copy()
+
+    def residuals(x):
+        p_full[free] = x
+        return weights * (model_reflectance(omega, p_full, n_env) - reflectance)
+
+    def jacobian(x):
+        p_full[free] = x
+        _, J = model_reflectance(omega, p_full, n_env, jacobian=True)
+        return weights[:, None] * J[:, free]
+
+    result = least_squares(residuals, p0[free], jac=jacobian,
+                           bounds=(bounds[0][free], bounds[1][free]),
+                           x_scale="jac", method="trf")
+    p_full[free] = result.x
+    return p_full, result.cost, result.success
+
+
+def _starting_points(p0, free, n_starts, bounds, seed):
+    """在初始值附近按对数均匀分布随机扰动，生成多起点（固定参数保持 p0 中的值不变）"""
+    rng = np.random.default_rng(seed)
+    starts = [p0]
+    for _ in range(n_starts - 1):
+        p = p0.copy()
+        p[free] *= np.exp(rng.uniform(-1, 1, size=free.sum()))
+        starts.append(np.clip(p, bounds[0], bounds[1]))
+    return starts
+
+
+def fit_spectrum(wavelength_nm, reflectance, n_env=1.0, p0=None, oscillators=(),
+                 fit_eps_inf=False, weights=None, n_starts=1, workers=None, seed=0):
+    """拟合单条反射光谱
+
+    p0 缺省时以 specture2.py 中的 wp、gamma 为初始值；oscillators 为 Lorentz 振子初始值。
+    fit_eps_inf=False 时固定 ε_inf = 1（与 specture2.py 一致）。
+    n_starts > 1 时进行多起点拟合，workers 不为 None 时在进程池中并行。
+    """
+    omega = drude.angular_frequency(wavelength_nm)
+    reflectance = np.asarray(reflectance, dtype=float)
+    weights = np.ones_like(reflectance) if weights is None else np.asarray(weights, dtype=float)
+    if p0 is None:
+        p0 = pack_params(oscillators=oscillators)
+    p0 = np.asarray(p0, dtype=float)
+
+    free = np.ones(len(p0), dtype=bool)
+    free[0] = fit_eps_inf
+    bounds = default_bounds(len(p0))
+
+    tasks = [(omega, reflectance, weights, p, free, n_env, bounds)
+             for p in _starting_points(p0, free, n_starts, bounds, seed)]
+    if workers is None or n_starts == 1:
+        results = list(map(_fit_once, tasks))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_fit_once, tasks))
+
+    p_best, cost, success = min(results, key=lambda item: item[1])
+    fit = unpack_params(p_best)
+    fit["cost"] = cost
+    fit["rms"] = np.sqrt(2 * cost / len(reflectance))
+    fit["success"] = success
+    return fit
+
+
+def _fit_spectrum_task(kwargs):
+    return fit_spectrum(**kwargs)
+
+
+def fit_spectra(wavelength_nm, reflectance, n_env=1.0, workers=None, **kwargs):
+    """批量拟合多条共享波长轴的光谱 (N, L)，每条光谱分配给进程池中的一个任务"""
+    reflectance = np.atleast_2d(reflectance)
+    tasks = [dict(wavelength_nm=wavelength_nm, reflectance=R, n_env=n_env, **kwargs)
+             for R in reflectance]
+    if workers is None:
+        return list(map(_fit_spectrum_task, tasks))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(_fit_spectrum_task, tasks))
+
+
+if __name__ == "__main__":
+    # 用 specture2.py 的参数生成一条“实测”光谱，再从偏离的初始值拟合回来
+    wavelengths_nm = np.linspace(300, 800, 500)
+    n_env = 1.33
+    omega = drude.angular_frequency(wavelengths_nm)
+    measured = model_reflectance(omega, pack_params(), n_env)
+
+    fit = fit_spectrum(wavelengths_nm, measured, n_env=n_env,
+                       p0=pack_params(wp=1.0e16, gamma=1.0e14), n_starts=4, workers=4)
+    print(f"wp = {fit['wp']:.4e} rad/s, gamma = {fit['gamma']:.4e} rad/s, rms = {fit['rms']:.2e}")
+
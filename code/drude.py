@@ -0,0 +1,38 @@
+import numpy as np
+
+# =============================================================================
+# Drude–Lorentz 色散模型（与 specture2.py 中的银 Drude 模型参数一致）
+#
+# ε(ω) = ε_inf - wp² / (ω² + iγω) + Σ_j f_j·ω_j² / (ω_j² - ω² - iγ_j·ω)
+# 所有函数均支持数组输入。
+# =============================================================================
+
+# 常量
+c = 3e8  # 光速 (m/s)
+wp = 1.39e16  # 等离子体频率 (rad/s)
+gamma = 2.73e13  # 阻尼频率 (rad/s)
+
+
+def angular_frequency(wavelength_nm):
+    """由波长 (nm) 计算角频率 (rad/s)"""
+    return 2 * np.pi * c / (np.asarray(wavelength_nm, dtype=float) * 1e-9)
+
+
+def drude_lorentz_epsilon(omega, eps_inf=1.0, wp=wp, gamma=gamma, oscillators=()):
+    """计算复介电常数，oscillators 为 [(f, omega_0, gamma_0), ...]"""
+    omega = np.asarray(omega, dtype=float)
+    epsilon = eps_inf - wp**2 / (omega**2 + 1j * gamma * omega)
+    for f, omega_0, gamma_0 in oscillators:
+        epsilon = epsilon + f * omega_0**2 / (omega_0**2 - omega**2 - 1j * gamma_0 * omega)
+    return epsilon
+
+
+def silver_dielectric_constant(wavelength_nm, wp=wp, gamma=gamma):
+    """通过 Drude 模型计算银的复介电常数，直接使用 nm 单位"""
+    return drude_lorentz_epsilon(angular_frequency(wavelength_nm), 1.0, wp, gamma)
+
+
+def refractive_index(epsilon):
+    """由复介电常数计算复折射率（取虚部非负的分支）"""
+    n = np.sqrt(np.asarray(epsilon, dtype=complex))
+    return np.where(n.imag < 0, -n, n)
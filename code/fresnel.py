@@ -0,0 +1,82 @@
+import numpy as np
+
+# =============================================================================
+# 广播式菲涅耳反射计算
+#
+# n1（入射介质）、n2（复折射率）和 theta_inc（入射角，度）可以是任意形状的数组，
+# 按 NumPy 广播规则一次性计算 s、p 偏振及非偏振反射率和反射相位，
+# 代替按波长逐点调用 fresnel_reflectance 的 Python 循环。
+# =============================================================================
+
+
+def normal_component(n, n1, theta_inc):
+    """计算 n·cos(θ) = sqrt(n² - (n1·sinθ_inc)²)，取虚部非负（衰减）的分支"""
+    sin_inc = n1 * np.sin(np.radians(theta_inc))
+    kz = np.sqrt(np.asarray(n, dtype=complex)**2 - sin_inc**2)
+    return np.where(kz.imag < 0, -kz, kz)
+
+
+def fresnel_coefficients(n1, n2, theta_inc):
+    """计算 s、p 偏振的复振幅反射系数 (r_s, r_p)"""
+    n1 = np.asarray(n1, dtype=complex)
+    n2 = np.asarray(n2, dtype=complex)
+    n1_cos_i = normal_component(n1, n1, theta_inc)
+    n2_cos_t = normal_component(n2, n1, theta_inc)
+
+    r_s = (n1_cos_i - n2_cos_t) / (n1_cos_i + n2_cos_t)
+    # r_p = (n2·cosθi - n1·cosθt) / (n2·cosθi + n1·cosθt)，分子分母同乘 n1·n2
+    r_p = (n2**2 * n1_cos_i - n1**2 * n2_cos_t) / (n2**2 * n1_cos_i + n1**2 * n2_cos_t)
+    return r_s, r_p
+
+
+def fresnel(n1, n2, theta_inc):
+    """返回包含 r_s、r_p、R_s、R_p、R（非偏振）以及 phase_s、phase_p（弧度）的字典"""
+    r_s, r_p = fresnel_coefficients(n1, n2, theta_inc)
+    R_s = np.abs(r_s)**2
+    R_p = np.abs(r_p)**2
+    return {
+        "r_s": r_s,
+        "r_p": r_p,
+        "R_s": R_s,
+        "R_p": R_p,
+        "R": (R_s + R_p) / 2,
+        "phase_s": np.angle(r_s),
+        "phase_p": np.angle(r_p),
+    }
+
+
+def fresnel_reflectance(n1, n2, theta_inc):
+    """计算菲涅耳反射率（非偏振），接口与 specture.py 中的原函数相同"""
+    r_s, r_p = fresnel_coefficients(n1, n2, theta_inc)
+    return (np.abs(r_s)**2 + np.abs(r_p)**2) / 2
+
+
+def fresnel_grid(wavelength_nm, theta_inc, n_env, index_function):
+    """在 波长 × 入射角 × 环境折射率 网格上计算菲涅耳反射
+
+    index_function(wavelength_nm) 返回材料复折射率，只对一维波长数组调用一次。
+    输出数组形状为 (len(wavelength_nm), len(theta_inc), len(n_env))。
+    """
+    wavelength_nm = np.atleast_1d(np.asarray(wavelength_nm, dtype=float))
+    theta_inc = np.atleast_1d(np.asarray(theta_inc, dtype=float))
+    n_env = np.atleast_1d(np.asarray(n_env))
+
+    n2 = np.asarray(index_function(wavelength_nm))[:, None, None]
+    return fresnel(n_env[None, None, :], n2, theta_inc[None, :, None])
+
+
+if __name__ == "__main__":
+    import time
+    import drude
+
+    def silver_index(wavelength_nm):
+        return drude.refractive_index(drude.silver_dielectric_constant(wavelength_nm))
+
+    wavelengths_nm = np.linspace(300, 800, 500)
+    angles = np.linspace(0, 89, 90)
+    n_envs = np.linspace(1.0, 1.6, 61)
+
+    start = time.perf_counter()
+    result = fresnel_grid(wavelengths_nm, angles, n_envs, silver_index)
+    elapsed = time.perf_counter() - start
+    print(f"{result['R'].size} 个点，耗时 {elapsed * 1e3:.1f} ms，输出形状 {result['R'].shape}")
@@ -0,0 +1,104 @@
+import os
+
+import cv2  # type: ignore
+import numpy as np
+
+# =============================================================================
+# 分块色相图：按 tile × tile 像素的网格统计遮盖气泡后图像的
+#   - 有效像素的圆周平均色相（度，0–360，无有效像素的块为 NaN）
+#   - 有效像素比例
+#   - 平均色度
+# 以及整图的平均色相 average_hue：所有块的单位向量和相加后取角度，
+# 即全部有效像素的圆周平均，与分块色相的定义完全一致。
+#
+# 注意：各脚本打印的平均色相（calculate_average_hue_*）定义不同——
+# 2 - 副本.py 直接对未减去 128 零点的 8 位 a、b 取 arctan2（只能落在 0–90°），
+# 各脚本都是算术平均而不是圆周平均。该数值在 .npz 中单独保存为 script_average_hue，
+# 不能直接与分块色相比较。
+# 通过 reshape 成 (块行, tile, 块列, tile) 后对块内两个轴求和完成分块归约，没有逐块的 Python 循环。
+# =============================================================================
+
+
+def _block_sum(values, tile):
+    """将 (H, W) 数组补零到 tile 的整数倍后按块求和，返回 (H/tile, W/tile)"""
+    h, w = values.shape
+    pad_h = -h % tile
+    pad_w = -w % tile
+    if pad_h or pad_w:
+        values = np.pad(values, ((0, pad_h), (0, pad_w)))
+    rows, cols = values.shape[0] // tile, values.shape[1] // tile
+    return values.reshape(rows, tile, cols, tile).sum(axis=(1, 3))
+
+
+def _hue_valid_chroma(img, brightness_threshold, space):
+    """逐像素计算色相（弧度）、有效像素掩码和色度"""
+    if space == "hsv":
+        # H 通道为 [0, 180)，乘 2 得到度数；亮度阈值按 V/255 计算（与 1 - 副本.py 相同）
+        h, s, v = cv2.split(cv2.cvtColor(img, cv2.COLOR_BGR2HSV))
+        hue = np.radians(h.astype(np.float32) * 2)
+        valid = v >= brightness_threshold * 255
+        chroma = s.astype(np.float32) * v.astype(np.float32) / 255**2  # (max - min) / 255
+    elif space == "lab":
+        # OpenCV 的 8 位 Lab 中 a、b 以 128 为零点；亮度阈值按 L 通道 (0–255) 计算（与 2 - 副本.py 相同）
+        L, a, b = cv2.split(cv2.cvtColor(img, cv2.COLOR_BGR2LAB))
+        a = a.astype(np.float32) - 128
+        b = b.astype(np.float32) - 128
+        hue = np.arctan2(b, a)
+        valid = L > brightness_threshold
+        chroma = np.hypot(a, b)
+    else:
+        raise ValueError(f"未知的颜色空间: {space}")
+    return hue, valid, chroma
+
+
+def hue_tile_map(img, tile=32, brightness_threshold=0.1, space="hsv"):
+    """计算遮盖气泡后图像（BGR）的分块色相图
+
+    返回字典：average_hue 为整图有效像素的圆周平均色相（度）；
+    hue、valid_fraction、chroma 形状均为 (ceil(H/tile), ceil(W/tile))。
+    边缘不足一块的部分只统计实际存在的像素。
+    """
+    hue, valid, chroma = _hue_valid_chroma(img, brightness_threshold, space)
+    weight = valid.astype(np.float32)
+
+    count = _block_sum(weight, tile)
+    pixels = _block_sum(np.ones_like(weight), tile)
+    sum_x = _block_sum(weight * np.cos(hue), tile)
+    sum_y = _block_sum(weight * np.sin(hue), tile)
+    sum_chroma = _block_sum(weight * chroma, tile)
+
+    # 圆周平均：对单位向量求和后取角度；没有有效像素或向量和为零的块记为 NaN
+    empty = (count == 0) | ((sum_x == 0) & (sum_y == 0))
+    hue_deg = np.mod(np.degrees(np.arctan2(sum_y, sum_x)), 360)
+    hue_deg[empty] = np.nan
+
+    total_x, total_y = sum_x.sum(), sum_y.sum()
+    if count.sum() == 0 or (total_x == 0 and total_y == 0):
+        average_hue = np.nan
+    else:
+        average_hue = np.mod(np.degrees(np.arctan2(total_y, total_x)), 360)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean_chroma = np.where(count > 0, sum_chroma / count, np.nan)
+
+    return {
+        "hue": hue_deg.astype(np.float32),
+        "valid_fraction": (count / pixels).astype(np.float32),
+        "chroma": mean_chroma.astype(np.float32),
+        "average_hue": np.float32(average_hue),
+        "tile": tile,
+        "space": space,
+    }
+
+
+def save_hue_tile_map(image_path, tile_map, script_average_hue=None):
+    """将分块色相图保存为 <图片名>_hue_tiles.npz，返回保存路径
+
+    average_hue 与分块色相定义一致；script_average_hue 为脚本自身算出的平均色相（定义不同，见文件开头）。
+    """
+    save_path = os.path.splitext(image_path)[0] + "_hue_tiles.npz"
+    np.savez_compressed(save_path,
+                        script_average_hue=np.nan if script_average_hue is None
+                        else script_average_hue,
+                        **tile_map)
+    return save_path
@@ -0,0 +1,242 @@
+import os
+from functools import lru_cache
+
+import numpy as np
+from scipy.interpolate import CubicSpline, PPoly
+
+import drude
+
+# =============================================================================
+# 材料色散表
+#
+# Material 对象在构造时一次性完成排序、转换为连续数组并预计算分段多项式（样条）系数，
+# 之后对整个波长数组求复折射率 n(λ) + i·k(λ) 时不再重建任何数组。
+# 表格数据可从本地 CSV / YAML 文件读取（YAML 采用 refractiveindex.info 的格式），
+# 解析结果缓存在有容量上限的 LRU 注册表中，遍历多种材料时不会重复解析文件。
+# =============================================================================
+
+# 本地材料库目录，布局与 refractiveindex.info 相同，例如 materials/main/Ag/Johnson.yml
+DATABASE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "materials")
+
+# 注册表中最多缓存的材料数量
+MATERIAL_CACHE_SIZE = 64
+
+
+def _piecewise(x, y, kind):
+    """预计算分段多项式：kind="cubic" 为三次样条，kind="linear" 为线性插值"""
+    if kind == "cubic" and len(x) >= 4:
+        return CubicSpline(x, y)
+    if len(x) == 1:
+        # 单点数据视为常数
+        return PPoly(np.array([[y[0]]]), np.array([x[0], x[0] + 1.0]))
+    slopes = np.diff(y) / np.diff(x)
+    return PPoly(np.vstack([slopes, y[:-1]]), x)
+
+
+class Material:
+    """表格化色散材料，波长单位 nm"""
+
+    def __init__(self, name, wavelength_nm, n, k=None, kind="cubic"):
+        wavelength_nm = np.asarray(wavelength_nm, dtype=float)
+        n = np.asarray(n, dtype=float)
+        k = np.zeros_like(n) if k is None else np.asarray(k, dtype=float)
+
+        order = np.argsort(wavelength_nm)
+        self.name = name
+        self.kind = kind
+        self.wavelength_nm = np.ascontiguousarray(wavelength_nm[order])
+        self.n = np.ascontiguousarray(n[order])
+        self.k = np.ascontiguousarray(k[order])
+        self._n_poly = _piecewise(self.wavelength_nm, self.n, kind)
+        self._k_poly = _piecewise(self.wavelength_nm, self.k, kind)
+
+    def __repr__(self):
+        return (f"Material({self.name!r}, {len(self.wavelength_nm)} points, "
+                f"{self.wavelength_nm[0]:g}-{self.wavelength_nm[-1]:g} nm, {self.kind})")
+
+    @property
+    def wavelength_range(self):
+        return self.wavelength_nm[0], self.wavelength_nm[-1]
+
+    def index(self, wavelength_nm):
+        """计算复折射率 n + ik，超出数据范围时取端点值（与 np.interp 一致）"""
+        wl = np.clip(np.asarray(wavelength_nm, dtype=float), *self.wavelength_range)
+        return self._n_poly(wl) + 1j * self._k_poly(wl)
+
+    def epsilon(self, wavelength_nm):
+        """计算复介电常数 ε = (n + ik)²"""
+        return self.index(wavelength_nm)**2
+
+    __call__ = index
+
+    @classmethod
+    def from_dict(cls, name, data, kind="cubic"):
+        """由 {波长 nm: (n, k)} 字典构造（与 specture.py 中 experimental_data 的格式相同）"""
+        wavelengths = np.array(list(data.keys()), dtype=float)
+        nk = np.array(list(data.values()), dtype=float)
+        return cls(name, wavelengths, nk[:, 0], nk[:, 1], kind=kind)
+
+    @classmethod
+    def from_csv(cls, path, name=None, kind="cubic"):
+        """读取 CSV 文件
+
+        支持两种格式：
+        1. 表头为 wavelength_nm,n,k（波长单位 nm）；
+        2. refractiveindex.info 导出格式：先是 wl,n 数据块，再是 wl,k 数据块（波长单位 µm）。
+        """
+        blocks = {}
+        column = None
+        scale = 1.0
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                fields = [field.strip() for field in line.split(",")]
+                if not _is_number(fields[0]):
+                    # 表头行：决定波长单位以及后续数据所属的列
+                    header = [field.lower() for field in fields]
+                    scale = 1000.0 if header[0] in ("wl", "wavelength_um") else 1.0
+                    column = tuple(header[1:])
+                    continue
+                blocks.setdefault(column, []).append([float(x) * (scale if i == 0 else 1.0)
+                                                      for i, x in enumerate(fields)])
+
+        name = name or os.path.splitext(os.path.basename(path))[0]
+        if ("n", "k") in blocks:
+            data = np.array(blocks[("n", "k")])
+            return cls(name, data[:, 0], data[:, 1], data[:, 2], kind=kind)
+        return cls._from_nk_blocks(name, blocks.get(("n",)), blocks.get(("k",)), kind)
+
+    @classmethod
+    def from_yaml(cls, path, name=None, kind="cubic"):
+        """读取 refractiveindex.info 格式的 YAML 文件（支持 tabulated nk / n / k，波长单位 µm）"""
+        import yaml  # 需要先安装： pip install pyyaml
+
+        with open(path, encoding="utf-8") as f:
+            document = yaml.safe_load(f)
+
+        blocks = {}
+        for entry in document.get("DATA", []):
+            kind_of_data = entry["type"].strip()
+            rows = [[float(x) for x in line.split()]
+                    for line in entry.get("data", "").strip().splitlines() if line.strip()]
+            data = np.array(rows)
+            data[:, 0] *= 1000.0  # µm -> nm
+            if kind_of_data == "tabulated nk":
+                blocks[("n", "k")] = data
+            elif kind_of_data == "tabulated n":
+                blocks[("n",)] = data
+            elif kind_of_data == "tabulated k":
+                blocks[("k",)] = data
+            else:
+                raise ValueError(f"{path}: 不支持的数据类型 {kind_of_data!r}")
+
+        name = name or os.path.splitext(os.path.basename(path))[0]
+        if ("n", "k") in blocks:
+            data = blocks[("n", "k")]
+            return cls(name, data[:, 0], data[:, 1], data[:, 2], kind=kind)
+        return cls._from_nk_blocks(name, blocks.get(("n",)), blocks.get(("k",)), kind)
+
+    @classmethod
+    def _from_nk_blocks(cls, name, n_block, k_block, kind):
+        """合并分开给出的 n、k 数据块，k 缺失时视为 0"""
+        if n_block is None:
+            raise ValueError(f"{name}: 缺少折射率 n 数据")
+        n_block = np.asarray(n_block, dtype=float)
+        wavelengths = n_block[:, 0]
+        k = None
+        if k_block is not None:
+            k_block = np.asarray(k_block, dtype=float)
+            order = np.argsort(k_block[:, 0])
+            k = np.interp(wavelengths, k_block[order, 0], k_block[order, 1])
+        return cls(name, wavelengths, n_block[:, 1], k, kind=kind)
+
+
+class ConstantMaterial:
+    """无色散材料（空气、水、氧化层等），复折射率为常数"""
+
+    def __init__(self, name, n, k=0.0):
+        self.name = name
+        self.n = n
+        self.k = k
+
+    def __repr__(self):
+        return f"ConstantMaterial({self.name!r}, n={self.n:g}, k={self.k:g})"
+
+    def index(self, wavelength_nm):
+        return np.full(np.shape(wavelength_nm), self.n + 1j * self.k)
+
+    def epsilon(self, wavelength_nm):
+        return self.index(wavelength_nm)**2
+
+    __call__ = index
+
+
+class DrudeMaterial:
+    """Drude–Lorentz 模型材料，参数含义见 drude.py"""
+
+    def __init__(self, name="Ag (Drude)", eps_inf=1.0, wp=drude.wp, gamma=drude.gamma,
+                 oscillators=()):
+        self.name = name
+        self.eps_inf = eps_inf
+        self.wp = wp
+        self.gamma = gamma
+        self.oscillators = tuple(oscillators)
+
+    def __repr__(self):
+        return f"DrudeMaterial({self.name!r}, wp={self.wp:.3e}, gamma={self.gamma:.3e})"
+
+    def epsilon(self, wavelength_nm):
+        omega = drude.angular_frequency(wavelength_nm)
+        return drude.drude_lorentz_epsilon(omega, self.eps_inf, self.wp, self.gamma,
+                                           self.oscillators)
+
+    def index(self, wavelength_nm):
+        return drude.refractive_index(self.epsilon(wavelength_nm))
+
+    __call__ = index
+
+
+def _is_number(text):
+    try:
+        float(text)
+    except ValueError:
+        return False
+    return True
+
+
+def material_path(name, database_dir=DATABASE_DIR):
+    """将材料名（如 "main/Ag/Johnson"）或文件路径解析为实际文件路径"""
+    if os.path.isfile(name):
+        return os.path.abspath(name)
+    for suffix in ("", ".yml", ".yaml", ".csv"):
+        path = os.path.join(database_dir, name + suffix)
+        if os.path.isfile(path):
+            return path
+    raise FileNotFoundError(f"在 {database_dir} 中找不到材料 {name!r}")
+
+
+@lru_cache(maxsize=MATERIAL_CACHE_SIZE)
+def _load_material(path, mtime, kind):
+    """按 (路径, 修改时间, 插值方式) 缓存解析结果，文件被修改后会重新解析"""
+    if path.endswith(".csv"):
+        return Material.from_csv(path, kind=kind)
+    return Material.from_yaml(path, kind=kind)
+
+
+def load_material(name, database_dir=DATABASE_DIR, kind="cubic"):
+    """从本地材料库加载材料，结果缓存在 LRU 注册表中"""
+    path = material_path(name, database_dir)
+    return _load_material(path, os.path.getmtime(path), kind)
+
+
+def clear_material_cache():
+    _load_material.cache_clear()
+
+
+if __name__ == "__main__":
+    silver = load_material("Ag_specture", kind="linear")
+    print(silver)
+    print(silver.index(np.linspace(400, 800, 5)))
+    print(_load_material.cache_info())
@@ -0,0 +1,230 @@
+import datetime
+import logging
+import queue
+import sqlite3
+import threading
+import time
+
+# =============================================================================
+# 批量写入、带全文索引的消息存储（SQLite）
+#
+# 收到消息时只把记录放进队列，由后台线程按条数或时间批量写入数据库，
+# 避免每条消息都打开、追加、关闭一次文件。
+#   - WAL 模式：写入时不阻塞查询；
+#   - FTS5 全文索引（trigram 分词，中文也能按子串检索，关键词至少 3 个字符）；
+#   - (user, timestamp) 和 timestamp 索引，用于按用户和时间范围快速查询。
+# 某一批写入失败（磁盘满、I/O 错误、数据库被锁或损坏）时会记录日志并重试，
+# 重试仍失败则丢弃该批并记录条数，后台线程继续运行；
+# 若后台线程意外退出，add() / flush() / close() 会抛出 RuntimeError，而不是静默丢消息或永久阻塞。
+# =============================================================================
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER PRIMARY KEY,
+    timestamp TEXT NOT NULL,
+    user TEXT NOT NULL,
+    chat TEXT,
+    text TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS messages_user_time ON messages (user, timestamp);
+CREATE INDEX IF NOT EXISTS messages_time ON messages (timestamp);
+CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5(
+    text, content='messages', content_rowid='id', tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS messages_ai AFTER INSERT ON messages BEGIN
+    INSERT INTO messages_fts (rowid, text) VALUES (new.id, new.text);
+END;
+"""
+
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+_STOP = object()
+
+logger = logging.getLogger(__name__)
+
+
+def _format_time(value):
+    """datetime 或字符串 → 'YYYY-MM-DD HH:MM:SS'（与原 txt 日志的时间格式相同）"""
+    if isinstance(value, datetime.datetime):
+        return value.strftime(TIME_FORMAT)
+    return value
+
+
+class MessageStore:
+    """消息存储：add() 只入队，后台线程在攒够 batch_size 条或距首条超过 flush_interval 秒时写入"""
+
+    def __init__(self, path="messages.db", batch_size=500, flush_interval=1.0, retries=3,
+                 retry_delay=0.5):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.dropped = 0  # 重试后仍写入失败而被丢弃的消息条数
+        self._queue = queue.Queue()
+        self._closed = False
+        self._error = None
+
+        connection = self._connect()
+        connection.executescript(SCHEMA)
+        connection.close()
+
+        self._writer = threading.Thread(target=self._write_loop, name="MessageStoreWriter",
+                                        daemon=True)
+        self._writer.start()
+
+    def _connect(self):
+        connection = sqlite3.connect(self.path, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _check_writer(self):
+        """后台写入线程已退出或发生过异常时抛出 RuntimeError"""
+        if self._error is not None or not self._writer.is_alive():
+            raise RuntimeError(f"消息存储 {self.path} 的后台写入线程已停止") from self._error
+
+    def add(self, user, text, chat=None, timestamp=None):
+        """记录一条消息（非阻塞）"""
+        if self._closed:
+            raise RuntimeError(f"消息存储 {self.path} 已关闭")
+        self._check_writer()
+        if timestamp is None:
+            timestamp = datetime.datetime.now()
+        self._queue.put((_format_time(timestamp), user, chat, text))
+
+    def flush(self):
+        """阻塞直到队列中已有的消息全部处理完（写入或因失败被丢弃）"""
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                self._check_writer()
+                self._queue.all_tasks_done.wait(timeout=0.5)
+        if not self._closed:
+            self._check_writer()
+
+    def close(self):
+        """写完剩余消息并停止后台线程"""
+        if self._closed:
+            return
+        self._closed = True
+        self._check_writer()
+        self._queue.put(_STOP)
+        self._writer.join()
+        if self._error is not None:
+            raise RuntimeError(f"消息存储 {self.path} 的后台写入线程异常退出") from self._error
+
+    def _write_batch(self, connection, batch):
+        """写入一批消息，失败时重试；重试仍失败则记录日志并丢弃该批"""
+        for attempt in range(1, self.retries + 1):
+            try:
+                with connection:
+                    connection.executemany(
+                        "INSERT INTO messages (timestamp, user, chat, text) VALUES (?, ?, ?, ?)",
+                        batch)
+                return
+            except sqlite3.Error:
+                logger.exception("写入 %d 条消息失败（第 %d/%d 次）", len(batch), attempt,
+                                 self.retries)
+                if attempt < self.retries:
+                    time.sleep(self.retry_delay * attempt)
+        self.dropped += len(batch)
+        logger.error("丢弃 %d 条消息（累计丢弃 %d 条）", len(batch), self.dropped)
+
+    def _write_loop(self):
+        try:
+            connection = self._connect()
+        except Exception as e:
+            self._error = e
+            logger.exception("无法打开消息数据库 %s", self.path)
+            return
+
+        batch = []
+        deadline = None
+        stopping = False
+
+        try:
+            while not stopping:
+                timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+                try:
+                    item = self._queue.get(timeout=timeout)
+                    if item is _STOP:
+                        stopping = True
+                    else:
+                        batch.append(item)
+                        if deadline is None:
+                            deadline = time.monotonic() + self.flush_interval
+                except queue.Empty:
+                    pass
+
+                if batch and (stopping or len(batch) >= self.batch_size
+                              or time.monotonic() >= deadline):
+                    try:
+                        self._write_batch(connection, batch)
+                    finally:
+                        for _ in batch:
+                            self._queue.task_done()
+                        batch = []
+                        deadline = None
+
+                if stopping:
+                    self._queue.task_done()
+        except Exception as e:
+            self._error = e
+            logger.exception("消息存储后台写入线程异常退出")
+        finally:
+            connection.close()
+
+    def search(self, keyword=None, user=None, start=None, end=None, limit=100):
+        """按关键词、用户和时间范围查询，返回 [(timestamp, user, chat, text), ...]，按时间倒序
+
+        keyword 不少于 3 个字符时使用 FTS5 全文索引，否则退化为 LIKE 子串匹配。
+        start、end 可以是 datetime 或 'YYYY-MM-DD HH:MM:SS' 字符串（包含端点）。
+        """
+        conditions, params = [], []
+        source = "messages m"
+        if keyword:
+            if len(keyword) >= 3:
+                source = "messages_fts f JOIN messages m ON m.id = f.rowid"
+                conditions.append("messages_fts MATCH ?")
+                params.append('"' + keyword.replace('"', '""') + '"')
+            else:
+                conditions.append("m.text LIKE ?")
+                params.append(f"%{keyword}%")
+        if user is not None:
+            conditions.append("m.user = ?")
+            params.append(user)
+        if start is not None:
+            conditions.append("m.timestamp >= ?")
+            params.append(_format_time(start))
+        if end is not None:
+            conditions.append("m.timestamp <= ?")
+            params.append(_format_time(end))
+
+        sql = f"SELECT m.timestamp, m.user, m.chat, m.text FROM {source}"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY m.timestamp DESC LIMIT ?"
+        params.append(limit)
+
+        connection = self._connect()
+        try:
+            return connection.execute(sql, params).fetchall()
+        finally:
+            connection.close()
+
+    def count(self, user=None):
+        """已写入的消息条数"""
+        connection = self._connect()
+        try:
+            if user is None:
+                return connection.execute("SELECT COUNT(*) FROM messages").fetchone()[0]
+            return connection.execute("SELECT COUNT(*) FROM messages WHERE user = ?",
+                                      (user,)).fetchone()[0]
+        finally:
+            connection.close()
@@ -0,0 +1,150 @@
+import numpy as np
+import colour  # 需要先安装： pip install colour-science
+
+# =============================================================================
+# 多光源 / 多观察者同色异谱（颜色不恒定性）批量计算
+#
+# 一次矩阵运算得到 (N 条光谱 × M 个光源 × K 个观察者) 的 XYZ / Lab / Hue 张量，
+# 代替按 光谱 × 光源 × 观察者 逐个调用 colour.sd_to_XYZ 的嵌套循环。
+# =============================================================================
+
+# 统一的采样波长：380–780 nm，步长 5 nm（与 SliceWrapper(380, 781, 5) 相同）
+WAVELENGTHS = np.arange(380, 781, 5, dtype=float)
+
+# 默认光源：日光、白炽灯、荧光灯以及 LED 系列
+DEFAULT_ILLUMINANTS = ("D65", "A", "FL2", "FL11",
+                       "LED-B1", "LED-B2", "LED-B3", "LED-B4", "LED-B5",
+                       "LED-BH1", "LED-RGB1", "LED-V1", "LED-V2")
+
+# 默认观察者：CIE 1931 2° 和 CIE 1964 10°
+DEFAULT_OBSERVERS = ("CIE 1931 2 Degree Standard Observer",
+                     "CIE 1964 10 Degree Standard Observer")
+
+
+def interpolation_matrix(wavelengths, grid=WAVELENGTHS):
+    """构造线性插值矩阵 W，使 values @ W.T 等价于对每一行做 np.interp"""
+    wavelengths = np.asarray(wavelengths, dtype=float)
+    order = np.argsort(wavelengths)
+    wl = wavelengths[order]
+    grid = np.asarray(grid, dtype=float)
+
+    # 超出数据范围的波长取端点值（与 np.interp 一致）
+    g = np.clip(grid, wl[0], wl[-1])
+    idx = np.clip(np.searchsorted(wl, g, side="right") - 1, 0, len(wl) - 2)
+    t = (g - wl[idx]) / (wl[idx + 1] - wl[idx])
+
+    W = np.zeros((len(grid), len(wl)))
+    rows = np.arange(len(grid))
+    W[rows, idx] = 1 - t
+    W[rows, idx + 1] += t
+
+    # 把列顺序还原为输入波长的原始顺序
+    W_unsorted = np.empty_like(W)
+    W_unsorted[:, order] = W
+    return W_unsorted
+
+
+def resample_spectra(wavelengths, reflectance, grid=WAVELENGTHS):
+    """将共享同一波长轴的多条光谱 (..., L) 一次性重采样到 grid 上"""
+    reflectance = np.asarray(reflectance, dtype=float)
+    W = interpolation_matrix(wavelengths, grid)
+    return reflectance @ W.T
+
+
+def illuminant_table(illuminants=DEFAULT_ILLUMINANTS, grid=WAVELENGTHS):
+    """返回光源相对光谱功率分布 (M, L)"""
+    table = []
+    for name in illuminants:
+        sd = colour.SDS_ILLUMINANTS[name]
+        table.append(np.interp(grid, sd.wavelengths, sd.values))
+    return np.array(table)
+
+
+def cmfs_table(observers=DEFAULT_OBSERVERS, grid=WAVELENGTHS):
+    """返回观察者色匹配函数 (K, L, 3)"""
+    table = []
+    for name in observers:
+        cmfs = colour.MSDS_CMFS[name]
+        table.append(np.stack([np.interp(grid, cmfs.wavelengths, cmfs.values[:, i])
+                               for i in range(3)], axis=-1))
+    return np.array(table)
+
+
+def tristimulus_weights(illuminants=DEFAULT_ILLUMINANTS, observers=DEFAULT_OBSERVERS,
+                        grid=WAVELENGTHS):
+    """计算归一化的三刺激值权重 (M, K, L, 3)，完美漫反射体的 Y = 100"""
+    S = illuminant_table(illuminants, grid)   # (M, L)
+    cmfs = cmfs_table(observers, grid)        # (K, L, 3)
+    weights = S[:, None, :, None] * cmfs[None, :, :, :]
+    k = 100 / weights[..., 1].sum(axis=-1)    # (M, K)
+    return weights * k[:, :, None, None]
+
+
+def spectra_to_XYZ(reflectance, weights):
+    """反射光谱 (N, L) 与权重 (M, K, L, 3) 相乘得到 XYZ (N, M, K, 3)，XYZ 以 100 为满值"""
+    reflectance = np.atleast_2d(reflectance)
+    M, K, L, _ = weights.shape
+    # 一次矩阵乘法：(N, L) @ (L, M·K·3)
+    W = np.moveaxis(weights, 2, 0).reshape(L, -1)
+    return (reflectance @ W).reshape(len(reflectance), M, K, 3)
+
+
+def metamerism_sweep(wavelengths, reflectance, illuminants=DEFAULT_ILLUMINANTS,
+                     observers=DEFAULT_OBSERVERS, grid=WAVELENGTHS):
+    """计算 N 条光谱在 M 个光源、K 个观察者下的 XYZ、Lab 和 Hue
+
+    reflectance 形状为 (N, len(wavelengths))，数值范围 0~1。
+    返回字典，其中 XYZ / Lab 的形状为 (N, M, K, 3)，Hue 的形状为 (N, M, K)。
+    """
+    R = resample_spectra(wavelengths, np.atleast_2d(reflectance), grid)
+    weights = tristimulus_weights(illuminants, observers, grid)
+
+    XYZ = spectra_to_XYZ(R, weights)
+    XYZ_white = weights.sum(axis=2)           # (M, K, 3)
+
+    # 每个 光源 × 观察者 组合使用各自的白点
+    whitepoints = colour.XYZ_to_xy(XYZ_white / 100)
+    Lab = colour.XYZ_to_Lab(XYZ / 100, illuminant=whitepoints)
+    LCH = colour.Lab_to_LCHab(Lab)
+
+    return {
+        "illuminants": tuple(illuminants),
+        "observers": tuple(observers),
+        "XYZ": XYZ,
+        "XYZ_white": XYZ_white,
+        "Lab": Lab,
+        "Chroma": LCH[..., 1],
+        "Hue": LCH[..., 2],
+    }
+
+
+def delta_E_to_reference(Lab, reference=(0, 0)):
+    """计算每个条件相对参考条件（默认第一个光源、第一个观察者）的 ΔE2000，返回 (N, M, K)"""
+    Lab_ref = Lab[:, reference[0], reference[1]][:, None, None, :]
+    return colour.delta_E(Lab_ref, Lab, method="CIE 2000")
+
+
+def delta_E_pairwise(Lab):
+    """计算所有条件两两之间的 ΔE2000，返回 (N, M·K, M·K)"""
+    flat = Lab.reshape(len(Lab), -1, 3)
+    return colour.delta_E(flat[:, :, None, :], flat[:, None, :, :], method="CIE 2000")
+
+
+if __name__ == "__main__":
+    import pandas as pd
+
+    # 读取与 color change 3.py 相同的光谱数据
+    df = pd.read_excel("reflectance.xlsx", sheet_name="Sheet2")
+    df.columns = df.columns.str.strip()
+    wavelengths = df["Wavelength"].astype(float).values
+    reflectance = df["Reflectance"].astype(float).values
+
+    result = metamerism_sweep(wavelengths, reflectance)
+    dE = delta_E_to_reference(result["Lab"])
+
+    for m, illuminant in enumerate(result["illuminants"]):
+        for k, observer in enumerate(result["observers"]):
+            L_val, a_val, b_val = result["Lab"][0, m, k]
+            print(f"{illuminant:>8} | {observer:<38} | "
+                  f"Lab = ({L_val:6.2f}, {a_val:6.2f}, {b_val:6.2f}) | "
+                  f"Hue = {result['Hue'][0, m, k]:6.2f}° | ΔE00 = {dE[0, m, k]:.2f}")
@@ -0,0 +1,107 @@
+import numpy as np
+
+from fresnel import normal_component
+
+# =============================================================================
+# 多层膜传输矩阵（特征矩阵）求解器
+#
+# 结构：入射介质 | 第 1 层 | 第 2 层 | ... | 基底（半无限，例如银）
+# 每层的 2×2 特征矩阵
+#     M_j = [[cos δ_j,          -i·sin δ_j / η_j],
+#            [-i·η_j·sin δ_j,   cos δ_j        ]],   δ_j = 2π·n_j·cosθ_j·d_j / λ
+# 对 偏振 × 厚度扫描 × 波长 × 入射角 整批相乘，只对层数做 Python 循环。
+# 2×2 乘法按矩阵元逐元素展开，比对 (..., 2, 2) 数组调用 np.matmul 快数倍。
+# 复折射率约定为 n + ik（与 fresnel.py、material.py 相同），
+# p 偏振反射系数的符号与 fresnel.py 保持一致。
+# =============================================================================
+
+
+def _index(medium, wavelength_nm):
+    """材料对象（带 index 方法）或数值 → 复折射率数组"""
+    if hasattr(medium, "index"):
+        return np.asarray(medium.index(wavelength_nm), dtype=complex)
+    return np.full(np.shape(wavelength_nm), medium, dtype=complex)
+
+
+def _admittance(n, kz):
+    """s、p 偏振的倾斜光学导纳 (η_s, η_p)，叠在最前面的偏振轴上"""
+    return np.stack(np.broadcast_arrays(kz, n**2 / kz))
+
+
+def multilayer(wavelength_nm, theta_inc, ambient, layers, substrate):
+    """计算多层膜的反射率和透射率
+
+    wavelength_nm、theta_inc 为一维数组；layers 为 [(材料, 厚度 nm), ...]，从入射侧到基底排列。
+    厚度可以是数组，用于批量厚度扫描：各层厚度数组按广播规则组合，
+    例如两层分别取形状 (T1, 1) 和 (1, T2) 即得到二维扫描。
+    返回字典，每个数组形状为 (*厚度扫描形状, len(wavelength_nm), len(theta_inc))。
+    """
+    wavelength_nm = np.atleast_1d(np.asarray(wavelength_nm, dtype=float))
+    theta_inc = np.atleast_1d(np.asarray(theta_inc, dtype=float))
+    wl = wavelength_nm[:, None]
+
+    thicknesses = [np.asarray(d, dtype=float) for _, d in layers]
+    sweep_shape = np.broadcast_shapes(*[d.shape for d in thicknesses]) if layers else ()
+    extra = (None,) * len(sweep_shape)
+
+    n0 = _index(ambient, wavelength_nm)[:, None]
+    eta0 = _admittance(n0, normal_component(n0, n0, theta_inc[None, :]))
+    n_sub = _index(substrate, wavelength_nm)[:, None]
+    eta_sub = _admittance(n_sub, normal_component(n_sub, n0, theta_inc[None, :]))
+
+    # 累积矩阵的四个矩阵元 [[m00, m01], [m10, m11]]，从单位矩阵开始
+    m00, m01, m10, m11 = 1.0, 0.0, 0.0, 1.0
+
+    for (material, _), d in zip(layers, thicknesses):
+        n = _index(material, wavelength_nm)[:, None]
+        kz = normal_component(n, n0, theta_inc[None, :])
+        eta = _admittance(n, kz)[(slice(None),) + extra]
+        d = d.reshape(d.shape + (1, 1))
+        delta = 2 * np.pi * kz * d / wl
+
+        cos_d = np.cos(delta)
+        sin_d = np.sin(delta)
+        a01 = -1j * sin_d / eta
+        a10 = -1j * eta * sin_d
+        m00, m01, m10, m11 = (m00 * cos_d + m01 * a10, m00 * a01 + m01 * cos_d,
+                              m10 * cos_d + m11 * a10, m10 * a01 + m11 * cos_d)
+
+    # [B, C]ᵀ = M_total · [1, η_sub]ᵀ
+    eta0 = eta0[(slice(None),) + extra]
+    eta_sub = eta_sub[(slice(None),) + extra]
+    B = m00 + m01 * eta_sub
+    C = m10 + m11 * eta_sub
+
+    shape = (2,) + sweep_shape + (len(wavelength_nm), len(theta_inc))
+    B, C = np.broadcast_to(B, shape), np.broadcast_to(C, shape)
+    r = (eta0 * B - C) / (eta0 * B + C)
+    r[1] = -r[1]  # p 偏振与 fresnel.py 的符号约定一致
+    T = 4 * eta0.real * eta_sub.real / np.abs(eta0 * B + C)**2
+    R = np.abs(r)**2
+
+    return {
+        "r_s": r[0],
+        "r_p": r[1],
+        "R_s": R[0],
+        "R_p": R[1],
+        "R": R.mean(axis=0),
+        "T_s": T[0],
+        "T_p": T[1],
+        "T": T.mean(axis=0),
+    }
+
+
+if __name__ == "__main__":
+    from material import ConstantMaterial, DrudeMaterial
+
+    # 水中的银，表面覆盖 0–100 nm 的聚合物层
+    water = ConstantMaterial("H2O", 1.33)
+    polymer = ConstantMaterial("PMMA", 1.49)
+    silver = DrudeMaterial()
+
+    wavelengths_nm = np.linspace(300, 800, 500)
+    angles = np.linspace(0, 80, 81)
+    thickness_nm = np.linspace(0, 100, 101)
+
+    result = multilayer(wavelengths_nm, angles, water, [(polymer, thickness_nm)], silver)
+    print(f"输出形状 {result['R'].shape}（厚度 × 波长 × 入射角）")
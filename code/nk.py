@@ -1,5 +1,5 @@
 import numpy as np
-from scipy.optimize import fsolve
+from nk_inversion import solve_n
 
 # 数据 (波长 nm 和反射率 Y)
 data = {
@@ -13,25 +13,16 @@ data = {
 # 环境介质折射率
 n_env = 1.0
 
-# 定义方程组
-def equations(params, R, n_env):
-    n, k = params
-    numerator = (n - n_env)**2 + k**2
-    denominator = (n + n_env)**2 + k**2
-    return [
-        R - numerator / denominator,
-        0  # 此处补充一个恒为 0 的伪方程，用于使返回值形状匹配
-    ]
+# 消光系数（单个反射率无法同时确定 n 和 k，这里固定 k 解析求解 n）
+k_fixed = 3.0
 
-# 数值求解
-results = {}
-for wavelength, reflectance in data.items():
-    # 初始猜测值 (n 和 k)
-    initial_guess = (0.2, 3.0)
-    solution = fsolve(equations, initial_guess, args=(reflectance, n_env))
-    results[wavelength] = solution
+# 解析求解（所有波长一次完成）
+wavelengths = np.array(list(data.keys()), dtype=float)
+reflectance = np.array(list(data.values()))
+n_values = solve_n(reflectance, k_fixed, n_env)
+k_values = np.full_like(n_values, k_fixed)
 
 # 输出结果
 print("Wavelength (nm), n, k")
-for wavelength, (n, k) in results.items():
-    print(f"{wavelength:.3f}, {n:.6f}, {k:.6f}")
\ No newline at end of file
+for wavelength, n, k in zip(wavelengths, n_values, k_values):
+    print(f"{wavelength:.3f}, {n:.6f}, {k:.6f}")
@@ -0,0 +1,73 @@
+import numpy as np
+
+# =============================================================================
+# 垂直入射菲涅耳反射率的解析反演
+#
+# R = ((n - n_env)^2 + k^2) / ((n + n_env)^2 + k^2)
+#
+# 单个反射率 R 只能确定一个方程，因此 (n, k) 不唯一：
+# 给定 k 可解出 n，给定 n 可解出 k，全部可行解在 (n, k) 平面上构成一段圆弧：
+#     (n - n_env·a)^2 + k^2 = ρ^2,   a = (1 + R) / (1 - R),   ρ = 2·n_env·√R / (1 - R)
+# 所有函数都基于数组运算，可同时处理成千上万个波长和多个 n_env（按 NumPy 规则广播）。
+# =============================================================================
+
+
+def normal_reflectance(n, k, n_env=1.0):
+    """正向计算：由 (n, k) 计算垂直入射反射率"""
+    n = np.asarray(n, dtype=float)
+    k = np.asarray(k, dtype=float)
+    numerator = (n - n_env)**2 + k**2
+    denominator = (n + n_env)**2 + k**2
+    return numerator / denominator
+
+
+def locus_circle(R, n_env=1.0):
+    """返回可行解圆的圆心 n 坐标和半径 (n_center, radius)"""
+    R = np.asarray(R, dtype=float)
+    n_center = n_env * (1 + R) / (1 - R)
+    radius = 2 * n_env * np.sqrt(R) / (1 - R)
+    return n_center, radius
+
+
+def solve_n(R, k, n_env=1.0, branch="lower"):
+    """给定 k 求 n
+
+    branch="lower" 返回较小的根（金属，n < n_env，与原 fsolve 从 (0.2, 3.0) 出发收敛的根相同），
+    branch="upper" 返回较大的根，branch="both" 返回 (lower, upper)。
+    无实数解（k 大于圆半径）的位置返回 NaN。
+    """
+    n_center, radius = locus_circle(R, n_env)
+    k = np.asarray(k, dtype=float)
+    disc = radius**2 - k**2
+    root = np.sqrt(np.where(disc >= 0, disc, np.nan))
+    lower = n_center - root
+    upper = n_center + root
+
+    if branch == "lower":
+        return lower
+    if branch == "upper":
+        return upper
+    if branch == "both":
+        return lower, upper
+    raise ValueError(f"未知的 branch: {branch}")
+
+
+def solve_k(R, n, n_env=1.0):
+    """给定 n 求 k（k >= 0），无实数解的位置返回 NaN"""
+    R = np.asarray(R, dtype=float)
+    n = np.asarray(n, dtype=float)
+    k_squared = (R * (n + n_env)**2 - (n - n_env)**2) / (1 - R)
+    return np.sqrt(np.where(k_squared >= 0, k_squared, np.nan))
+
+
+def nk_locus(R, n_env=1.0, num=181):
+    """返回每个反射率对应的完整可行 (n, k) 轨迹
+
+    输出形状为 R 与 n_env 广播后的形状再加上最后一维 num，
+    轨迹按圆心角从 π（n 最小）到 0（n 最大）采样，只保留 k >= 0 的上半圆。
+    """
+    n_center, radius = locus_circle(R, n_env)
+    phi = np.linspace(np.pi, 0, num)
+    n = n_center[..., None] + radius[..., None] * np.cos(phi)
+    k = radius[..., None] * np.sin(phi)
+    return n, k
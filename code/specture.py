@@ -1,5 +1,7 @@
 import numpy as np
 import matplotlib.pyplot as plt
+from fresnel import fresnel_reflectance
+from material import Material
 
 # 实验数据（波长 nm 对应的 n 和 k 值）
 experimental_data = {
@@ -10,38 +12,22 @@ experimental_data = {
     1000.000: (0.057385, 3.000000),
 }
 
+# 银的色散表：只在此处排序并预计算插值系数一次（线性插值，与 np.interp 结果相同）
+silver = Material.from_dict("Ag (experimental)", experimental_data, kind="linear")
+
 # 插值折射率函数
 def interpolate_refractive_index(wavelength_nm):
     """根据实验数据插值计算特定波长下的复折射率"""
-    wavelengths = np.array(list(experimental_data.keys()))
-    n_values = np.array([val[0] for val in experimental_data.values()])
-    k_values = np.array([val[1] for val in experimental_data.values()])
-    
-    # 插值 n 和 k
-    n = np.interp(wavelength_nm, wavelengths, n_values)
-    k = np.interp(wavelength_nm, wavelengths, k_values)
-    return n + 1j * k
-
-def fresnel_reflectance(n1, n2, theta_inc):
-    """计算菲涅耳反射率"""
-    theta_inc_rad = np.radians(theta_inc)
-    cos_theta_t = np.sqrt(1 - (n1 / n2 * np.sin(theta_inc_rad))**2)
-    r_s = (n1 * np.cos(theta_inc_rad) - n2 * cos_theta_t) / \
-          (n1 * np.cos(theta_inc_rad) + n2 * cos_theta_t)
-    r_p = (n2 * np.cos(theta_inc_rad) - n1 * cos_theta_t) / \
-          (n2 * np.cos(theta_inc_rad) + n1 * cos_theta_t)
-    return (np.abs(r_s)**2 + np.abs(r_p)**2) / 2
+    return silver.index(wavelength_nm)
 
 # 设置波长范围和入射角
 wavelengths_nm = np.linspace(400, 800, 500)  # 波长范围 (nm)
 theta_inc = 0  # 垂直入射
 n_env = 1  # 环境折射率（空气）
 
-# 计算反射率
-reflectance = []
-for wavelength_nm in wavelengths_nm:
-    n_ag = interpolate_refractive_index(wavelength_nm)  # 银的复折射率
-    reflectance.append(fresnel_reflectance(n_env, n_ag, theta_inc))
+# 计算反射率（所有波长一次完成）
+n_ag = interpolate_refractive_index(wavelengths_nm)  # 银的复折射率
+reflectance = fresnel_reflectance(n_env, n_ag, theta_inc)
 
 # 绘制反射光谱
 plt.figure(figsize=(8, 6))
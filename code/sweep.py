@@ -0,0 +1,193 @@
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from numpy.lib.format import open_memmap
+
+import drude
+from fresnel import fresnel_reflectance
+from nk_inversion import normal_reflectance
+
+# =============================================================================
+# Drude 反射率模型的并行参数扫描
+#
+# 对 wp × gamma × n_env 网格按块（chunk）向量化计算反射光谱，块分配到进程池中，
+# 结果直接写入磁盘上的 .npy 内存映射文件，坐标轴信息保存在同目录的 axes.json 中。
+# 内存占用只与块大小有关；读取时同样通过内存映射，只加载所需的切片。
+#
+# 结果目录结构：
+#     <path>/reflectance.npy   形状 (len(wp), len(gamma), len(n_env), len(wavelength_nm))
+#     <path>/axes.json         各坐标轴数值、波长及入射角
+# =============================================================================
+
+AXES = ("wp", "gamma", "n_env")
+DATA_FILE = "reflectance.npy"
+AXES_FILE = "axes.json"
+
+
+def parameter_axis(values):
+    """参数范围 {"start": ..., "stop": ..., "num": ...} 或数值序列 → 一维数组
+
+    范围只能用字典给出（包含端点，等同 np.linspace），元组、列表等序列一律按网格数值处理，
+    因此 (1.0, 1.33, 1.5) 就是三个取值。
+    """
+    if isinstance(values, dict):
+        if set(values) != {"start", "stop", "num"}:
+            raise ValueError(f"参数范围必须且只能包含 start、stop、num，实际为 {sorted(values)}")
+        num = values["num"]
+        if isinstance(num, bool) or not isinstance(num, (int, np.integer)) or num < 1:
+            raise ValueError(f"参数范围的 num 必须是正整数，实际为 {num!r}")
+        axis = np.linspace(values["start"], values["stop"], num)
+        expected = num
+    else:
+        axis = np.asarray(values, dtype=float)
+        if axis.ndim > 1:
+            raise ValueError(f"参数网格必须是一维数值序列，实际形状为 {axis.shape}")
+        axis = np.atleast_1d(axis)
+        expected = np.size(values)
+    if len(axis) != expected or len(axis) == 0:
+        raise ValueError(f"参数轴长度为 {len(axis)}，与给定的 {expected} 个取值不符")
+    return axis
+
+
+def drude_reflectance(wavelength_nm, wp, gamma, n_env, theta_inc=0):
+    """批量计算反射光谱：wp、gamma、n_env 为长度 P 的数组，返回 (P, len(wavelength_nm))"""
+    omega = drude.angular_frequency(wavelength_nm)[None, :]
+    wp = np.asarray(wp, dtype=float)[:, None]
+    gamma = np.asarray(gamma, dtype=float)[:, None]
+    n_env = np.asarray(n_env, dtype=float)[:, None]
+    n_ag = drude.refractive_index(drude.drude_lorentz_epsilon(omega, 1.0, wp, gamma))
+    if np.all(np.asarray(theta_inc) == 0):
+        # 垂直入射时 s、p 偏振相同，直接用实数形式的公式，约快 3 倍
+        return normal_reflectance(n_ag.real, n_ag.imag, n_env)
+    return fresnel_reflectance(n_env, n_ag, theta_inc)
+
+
+def _compute_chunk(args):
+    """计算扁平索引 [start, stop) 范围内的光谱并写入内存映射文件（供进程池调用）"""
+    path, axes, wavelength_nm, theta_inc, start, stop = args
+    data = np.load(os.path.join(path, DATA_FILE), mmap_mode="r+")
+    grid_shape = data.shape[:-1]
+
+    index = np.unravel_index(np.arange(start, stop), grid_shape)
+    params = [axis[i] for axis, i in zip(axes, index)]
+    spectra = drude_reflectance(wavelength_nm, *params, theta_inc=theta_inc)
+
+    data.reshape(-1, data.shape[-1])[start:stop] = spectra
+    data.flush()
+    del data
+    return stop - start
+
+
+def run_sweep(path, wavelength_nm, wp, gamma, n_env, theta_inc=0, chunk_size=4096,
+              workers=None, dtype=np.float32):
+    """执行参数扫描并把结果写入 path 目录
+
+    wp、gamma、n_env 可以是数值序列，或 {"start": ..., "stop": ..., "num": ...} 形式的范围。
+    chunk_size 为每块计算的光谱条数，workers 为进程数（None 时在当前进程中顺序计算）。
+    返回打开的 SweepStore。
+    """
+    wavelength_nm = np.asarray(wavelength_nm, dtype=float)
+    axes = [parameter_axis(values) for values in (wp, gamma, n_env)]
+    grid_shape = tuple(len(axis) for axis in axes)
+    total = int(np.prod(grid_shape))
+
+    os.makedirs(path, exist_ok=True)
+    data = open_memmap(os.path.join(path, DATA_FILE), mode="w+", dtype=dtype,
+                       shape=grid_shape + (len(wavelength_nm),))
+    del data
+
+    metadata = {name: axis.tolist() for name, axis in zip(AXES, axes)}
+    metadata["wavelength_nm"] = wavelength_nm.tolist()
+    metadata["theta_inc"] = theta_inc
+    with open(os.path.join(path, AXES_FILE), "w", encoding="utf-8") as f:
+        json.dump(metadata, f)
+
+    tasks = [(path, axes, wavelength_nm, theta_inc, start, min(start + chunk_size, total))
+             for start in range(0, total, chunk_size)]
+    if workers is None:
+        for task in tasks:
+            _compute_chunk(task)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for _ in executor.map(_compute_chunk, tasks):
+                pass
+
+    return SweepStore(path)
+
+
+class SweepStore:
+    """只读打开扫描结果，按坐标值或索引取切片，不会把整个网格读入内存"""
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, AXES_FILE), encoding="utf-8") as f:
+            metadata = json.load(f)
+        self.axes = {name: np.array(metadata[name]) for name in AXES}
+        self.wavelength_nm = np.array(metadata["wavelength_nm"])
+        self.theta_inc = metadata["theta_inc"]
+        self.data = np.load(os.path.join(path, DATA_FILE), mmap_mode="r")
+
+    def __repr__(self):
+        sizes = ", ".join(f"{name}={len(axis)}" for name, axis in self.axes.items())
+        return f"SweepStore({self.path!r}, {sizes}, wavelength={len(self.wavelength_nm)})"
+
+    @property
+    def shape(self):
+        return self.data.shape
+
+    def nearest(self, name, value):
+        """返回坐标轴 name 上最接近 value 的索引"""
+        return int(np.abs(self.axes[name] - value).argmin())
+
+    def _index(self, coords):
+        """坐标值 → 每个坐标轴上的索引（整数或 slice）"""
+        index = []
+        for name in AXES:
+            if name not in coords:
+                index.append(slice(None))
+                continue
+            value = coords[name]
+            if isinstance(value, slice):
+                axis = self.axes[name]
+                lo = -np.inf if value.start is None else value.start
+                hi = np.inf if value.stop is None else value.stop
+                selected = np.flatnonzero((axis >= lo) & (axis <= hi))
+                index.append(slice(selected[0], selected[-1] + 1) if len(selected) else slice(0, 0))
+            else:
+                index.append(self.nearest(name, value))
+        return tuple(index)
+
+    def sel(self, **coords):
+        """按坐标值选取（取最接近的网格点），例如 store.sel(wp=1.39e16, n_env=1.33)
+
+        坐标值也可以是 slice（按数值范围选取）。返回的数组只包含所选切片。
+        """
+        return np.asarray(self.data[self._index(coords)])
+
+    def sel_axes(self, **coords):
+        """与 sel() 参数相同，返回所选切片对应的坐标值 {名称: 数组或标量}"""
+        return {name: self.axes[name][i] for name, i in zip(AXES, self._index(coords))}
+
+    def isel(self, **indices):
+        """按索引选取，例如 store.isel(gamma=0)"""
+        index = tuple(indices.get(name, slice(None)) for name in AXES)
+        return np.asarray(self.data[index])
+
+
+if __name__ == "__main__":
+    import tempfile
+    import time
+
+    wavelengths_nm = np.linspace(300, 800, 251)
+    path = os.path.join(tempfile.gettempdir(), "drude_sweep")
+
+    start = time.perf_counter()
+    store = run_sweep(path, wavelengths_nm,
+                      wp={"start": 1.2e16, "stop": 1.5e16, "num": 100},
+                      gamma={"start": 1e13, "stop": 1e14, "num": 100},
+                      n_env=(1.0, 1.33, 1.5),
+                      workers=os.cpu_count())
+    print(f"{store}，耗时 {time.perf_counter() - start:.1f} s")
+    print(store.sel(wp=1.39e16, gamma=2.73e13, n_env=1.33)[:5])
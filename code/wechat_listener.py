@@ -1,23 +1,31 @@
 import itchat
 from itchat.content import TEXT
-import datetime
+from message_store import MessageStore
 
-# 设置要监听的用户昵称
-TARGET_USER = '目标用户昵称'
+# 设置要监听的用户昵称（可以同时监听多个用户）
+TARGET_USERS = {'目标用户昵称'}
+
+# 消息存储（SQLite，后台线程批量写入，支持关键词和时间范围查询）
+store = MessageStore("wechat_messages.db")
 
 # 登录微信
 itchat.auto_login(hotReload=True)
 
-# 消息处理函数
+# 消息处理函数（私聊和群聊）
+@itchat.msg_register(TEXT, isGroupChat=True)
 @itchat.msg_register(TEXT)
 def text_reply(msg):
+    # 群聊消息的发送者昵称在 ActualNickName 中，私聊则是对方昵称
+    chat = msg['User']['NickName']
+    sender = msg.get('ActualNickName') or chat
     # 检查消息是否来自目标用户
-    if msg['User']['NickName'] == TARGET_USER:
-        print(f"收到来自 {TARGET_USER} 的消息：{msg['Text']}")
-        # 将消息存储到文件
-        with open(f"{TARGET_USER}_messages.txt", "a", encoding="utf-8") as f:
-            timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            f.write(f"[{timestamp}] {msg['Text']}\n")
+    if sender in TARGET_USERS:
+        print(f"收到来自 {sender} 的消息：{msg['Text']}")
+        # 将消息放入存储队列，由后台线程批量写入数据库
+        store.add(sender, msg['Text'], chat=chat)
 
 # 保持微信在线
-itchat.run()
+try:
+    itchat.run()
+finally:
+    store.close()